@@ -6,6 +6,9 @@ cap = cv2.VideoCapture(INDEX, cv2.CAP_AVFOUNDATION)
 if not cap.isOpened():
     raise RuntimeError(f"Could not open camera index {INDEX}")
 
+# Match the main app: keep only the freshest frame so the preview shows real latency.
+cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
 while True:
     ok, frame = cap.read()
     if not ok:
@@ -13,7 +16,8 @@ while True:
         break
 
     cv2.imshow(f"Camera {INDEX} (press q to quit)", frame)
-    if cv2.waitKey(1) & 0xFF == ord("q"):
+    # pollKey() doesn't sleep; cap.read() already blocks until the next frame.
+    if cv2.pollKey() & 0xFF == ord("q"):
         break
 
 cap.release()
@@ -1,10 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 
-for i in range(10):
+
+def probe(i):
+    # Distinct capture objects are safe to open concurrently; missing indices
+    # can block for seconds on AVFoundation, so probe them in parallel.
     cap = cv2.VideoCapture(i, cv2.CAP_AVFOUNDATION)  # macOS backend
     ok = cap.isOpened()
-    print(i, "OK" if ok else "no")
-    if ok:
-        ret, frame = cap.read()
-        print("  read:", ret, "shape:", None if frame is None else frame.shape)
+    ret, frame = (cap.read() if ok else (False, None))
     cap.release()
+    return i, ok, ret, None if frame is None else frame.shape
+
+
+with ThreadPoolExecutor(max_workers=8) as ex:
+    for i, ok, ret, shape in ex.map(probe, range(10)):
+        print(i, "OK" if ok else "no")
+        if ok:
+            print("  read:", ret, "shape:", shape)
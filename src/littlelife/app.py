@@ -9,9 +9,11 @@ from __future__ import annotations
 # Standard library
 # =====================================================
 import os
+import queue
 import sys
 import threading
 import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -53,7 +55,7 @@ if str(APP_DIR) not in sys.path:
 # Third-party imports
 # =====================================================
 from PySide6.QtCore import Qt, Signal, QObject, QTimer
-from PySide6.QtGui import QPixmap, QPalette, QColor, QImage
+from PySide6.QtGui import QPixmap, QPalette, QColor, QImage, QImageReader
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -69,10 +71,20 @@ from PySide6.QtWidgets import (
     QComboBox,
 )
 
-import cv2
+# cv2/numpy (camera only) and identify_image (which pulls in openai) are imported
+# lazily, so their import cost is paid after QApplication is up rather than before it.
+cv2 = None
+np = None
 
-# Local import (identify_image.py expects OPENAI_API_KEY from env or secrets_store)
-from identify_image import identify_image
+
+def _load_camera_libs():
+    """Bind the cv2/numpy module globals on first use (free afterwards)."""
+    global cv2, np
+    if cv2 is None:
+        import cv2 as _cv2
+        import numpy as _np
+
+        cv2, np = _cv2, _np
 
 
 # =====================================================
@@ -86,6 +98,34 @@ def _env_bool(name: str, default: bool = True) -> bool:
     return v.strip().lower() not in {"0", "false", "no", "off", ""}
 
 
+def _env_int(
+    name: str, default: int, lo: Optional[int] = None, hi: Optional[int] = None
+) -> int:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    try:
+        n = int(v)
+    except ValueError:
+        print(f"[Config] Invalid {name}={v!r}; using {default}")
+        return default
+    clamped = max(lo, n) if lo is not None else n
+    clamped = min(hi, clamped) if hi is not None else clamped
+    if clamped != n:
+        print(f"[Config] {name}={n} out of range; using {clamped}")
+    return clamped
+
+
+# Parsed once at startup (after .env is loaded); MainWindow just reads these.
+CAMERA_ENABLED = _env_bool("CAMERA_ENABLED", default=True)
+CAMERA_INDEX = _env_int("CAMERA_INDEX", 0)
+CAMERA_WIDTH = _env_int("CAMERA_WIDTH", 1280)
+CAMERA_HEIGHT = _env_int("CAMERA_HEIGHT", 720)
+CAMERA_TIMER_MS = _env_int("CAMERA_TIMER_MS", 33)
+CAPTURE_JPEG_QUALITY = _env_int("CAPTURE_JPEG_QUALITY", 85, lo=1, hi=100)
+
+
+@lru_cache(maxsize=1)
 def choose_opencv_backend() -> int:
     """
     Choose an OpenCV VideoCapture backend.
@@ -97,7 +137,12 @@ def choose_opencv_backend() -> int:
     - Linux: V4L2 (best for USB microscopes)
     - macOS: AVFoundation
     - Windows: auto
+
+    Evaluated once per process (CAMERA_BACKEND is read at first call); cached
+    rather than module-level because cv2 is imported lazily.
     """
+    _load_camera_libs()
+
     pref = (os.getenv("CAMERA_BACKEND", "auto") or "auto").strip().lower()
 
     # Not all OpenCV builds have all these constants, but most do.
@@ -119,13 +164,18 @@ def choose_opencv_backend() -> int:
     return 0
 
 
-def qpixmap_from_bgr(frame_bgr) -> QPixmap:
-    """Convert an OpenCV BGR frame to a QPixmap (copying memory safely)."""
-    rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-    h, w, ch = rgb.shape
-    bytes_per_line = ch * w
-    qimg = QImage(rgb.data, w, h, bytes_per_line, QImage.Format_RGB888).copy()
-    return QPixmap.fromImage(qimg)
+def fit_size(src_w: int, src_h: int, box_w: int, box_h: int) -> tuple[int, int]:
+    """Largest (w, h) with the source aspect ratio that fits inside the box."""
+    scale = min(box_w / src_w, box_h / src_h)
+    return max(1, int(src_w * scale)), max(1, int(src_h * scale))
+
+
+def _identify(img_path: str, sample_type: str) -> dict:
+    # Local import (identify_image.py expects OPENAI_API_KEY from env or secrets_store).
+    # First identify pays the openai import cost here, off the UI thread.
+    from identify_image import identify_image
+
+    return identify_image(img_path, sample_type=sample_type)
 
 
 # =====================================================
@@ -255,24 +305,61 @@ class MainWindow(QMainWindow):
         # App state
         # ===============================
         self.current_image_path: Optional[str] = None
+        # Fixed ring of capture files, overwritten in turn (bounded disk use). Each
+        # slot is created on first use, so camera-less runs leave nothing in /tmp.
+        self.capture_ring_size = 4
         self.temp_files: list[str] = []
+        self._capture_i = 0
 
         self.signals = WorkerSignals()
         self.signals.success.connect(self._on_identify_success)
         self.signals.error.connect(self._on_identify_error)
 
+        # One shared daemon identify worker (never holds the process open at exit).
+        # Requests are tagged with a generation; bumping it drops superseded ones.
+        self._identify_queue: queue.Queue = queue.Queue()
+        self._identify_gen = 0
+        threading.Thread(target=self._identify_worker, daemon=True).start()
+
         # ===============================
         # Camera (optional live view)
         # ===============================
-        self.camera_enabled = _env_bool("CAMERA_ENABLED", default=True)
-        self.camera_index = int(os.getenv("CAMERA_INDEX", "0"))
-        self.camera_width = int(os.getenv("CAMERA_WIDTH", "1280"))
-        self.camera_height = int(os.getenv("CAMERA_HEIGHT", "720"))
-        self.camera_timer_ms = int(os.getenv("CAMERA_TIMER_MS", "33"))
+        self.camera_enabled = CAMERA_ENABLED
+        self.camera_index = CAMERA_INDEX
+        self.camera_width = CAMERA_WIDTH
+        self.camera_height = CAMERA_HEIGHT
+        self.camera_timer_ms = CAMERA_TIMER_MS
+        self.capture_jpeg_quality = CAPTURE_JPEG_QUALITY
 
         self.cap = None
         self.last_frame = None
 
+        # Producer thread grabs frames; the UI timer only converts/displays the newest one.
+        self._latest = None
+        self._free_frames: list = []  # recycled BGR buffers for cap.retrieve()
+        self._lock = threading.Lock()
+        self._grab_thread: Optional[threading.Thread] = None
+
+        # Per-thread events (replaced on each camera start). While the grab thread
+        # runs it owns self.cap: release is handed to it under _cap_lock.
+        self._cap_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._grab_release = threading.Event()
+        self._grab_done = threading.Event()
+        self._grab_done.set()
+
+        # Preview target size; refreshed in resizeEvent instead of per frame.
+        self._display_size: Optional[tuple[int, int]] = None
+
+        # Persistent display buffer + QImage view over it; rebuilt only when the size changes.
+        self._display_buf = None
+        self._qimage: Optional[QImage] = None
+
+        # The downscale module once its optional Numba kernel is compiled (see
+        # downscale.py); None until then, or for good if Numba is unavailable.
+        self._downscale = None
+        self._downscale_tried = False
+
         self.timer = QTimer(self)
         self.timer.timeout.connect(self._update_camera_frame)
 
@@ -296,17 +383,30 @@ class MainWindow(QMainWindow):
         if not file_path:
             return
 
-        # If camera is running, stop preview while showing a loaded still.
+        # If camera is running, stop preview (and frame grabbing) while showing a loaded still.
         if self.camera_enabled:
             self.timer.stop()
+            self._stop_grab_thread()
+
+        self._cancel_pending()
 
         self.current_image_path = file_path
         self.loaded_path_label.setText(file_path)
 
-        pix = QPixmap(file_path)
+        # Preview only: decode at (near) label size so libjpeg can use DCT scaling
+        # instead of decoding the full-res file. identify_image still gets the original.
+        reader = QImageReader(file_path)
+        reader.setAutoTransform(True)
+        orig = reader.size()
+        if orig.isValid():
+            reader.setScaledSize(orig.scaled(self.image_label.size(), Qt.KeepAspectRatio))
+        img = reader.read()
+
+        pix = QPixmap.fromImage(img)
         if pix.isNull():
             self.image_label.setText("Could not load image preview.")
         else:
+            # Reader may not support scaled decoding; keep the smooth scale as a fallback.
             self.image_label.setPixmap(
                 pix.scaled(
                     self.image_label.size(),
@@ -322,13 +422,10 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage("Image loaded. Ready to identify.")
 
     def _start_camera(self):
+        _load_camera_libs()
+
         # Release prior capture if any
-        if self.cap is not None:
-            try:
-                self.cap.release()
-            except Exception:
-                pass
-            self.cap = None
+        self._release_camera()
 
         backend = choose_opencv_backend()
 
@@ -349,6 +446,13 @@ class MainWindow(QMainWindow):
             self.capture_btn.setEnabled(False)
             return
 
+        # Keep only the freshest frame in the driver queue (lower preview latency).
+        if not self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            print("[Camera] Warning: backend ignored CAP_PROP_BUFFERSIZE=1")
+
+        # MJPG lets USB2 microscopes stream 1280x720 @ 30 fps (raw YUYV saturates the bus).
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.camera_width)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.camera_height)
 
@@ -358,27 +462,165 @@ class MainWindow(QMainWindow):
 
         print(f"[Camera] Active: {w}x{h} @ {fps:.2f} fps (index={self.camera_index})")
 
-        self.timer.start(self.camera_timer_ms)
+        if not self._downscale_tried:
+            self._downscale_tried = True
+            threading.Thread(target=self._warm_up_downscale, daemon=True).start()
+
+        # Buffers in flight: one being retrieved, one published, one shown (last_frame).
+        with self._lock:
+            self._free_frames = [np.empty((h, w, 3), np.uint8) for _ in range(3)]
+
+        self._stop = threading.Event()
+        self._grab_release = threading.Event()
+        self._grab_done = threading.Event()
+        self._grab_thread = threading.Thread(
+            target=self._grab_loop,
+            args=(self.cap, self._stop, self._grab_release, self._grab_done),
+            daemon=True,
+        )
+        self._grab_thread.start()
+
+        # Pace UI redraws to the negotiated FPS (15-66 ms); fall back to CAMERA_TIMER_MS.
+        interval = max(15, min(66, int(1000 / fps))) if fps > 0 else self.camera_timer_ms
+        self.timer.start(interval)
         self.statusBar().showMessage(f"Live camera running (index {self.camera_index}).")
 
-    def _update_camera_frame(self):
-        if self.cap is None:
+    def _grab_loop(self, cap, stop, release, done):
+        try:
+            self._grab_frames(cap, stop)
+        finally:
+            # If the UI gave up waiting for us, releasing cap is our job.
+            with self._cap_lock:
+                done.set()
+                if release.is_set():
+                    try:
+                        cap.release()
+                    except Exception:
+                        pass
+
+    def _grab_frames(self, cap, stop):
+        # Runs off the UI thread: cap.grab() blocks for a full frame interval.
+        # Frames are decoded into recycled buffers, so steady state allocates nothing.
+        while not stop.is_set():
+            if not cap.grab():
+                stop.wait(0.01)
+                continue
+
+            with self._lock:
+                buf = self._free_frames.pop() if self._free_frames else None
+
+            # OpenCV reallocates (returns a new array) if buf's shape doesn't match.
+            ok, frame = cap.retrieve(buf)
+            if not ok or frame is None:
+                if buf is not None:
+                    with self._lock:
+                        self._free_frames.append(buf)
+                continue
+
+            with self._lock:
+                if stop.is_set():
+                    break
+                dropped = self._latest
+                self._latest = frame
+                if dropped is not None:
+                    self._free_frames.append(dropped)
+
+    def _warm_up_downscale(self):
+        # JIT-compile off the UI thread; preview uses cv2.resize until this finishes.
+        try:
+            import downscale
+
+            if downscale.HAVE_NUMBA:
+                downscale.warm_up()
+                self._downscale = downscale
+        except Exception as e:
+            print(f"[Camera] Numba downscale unavailable: {e}")
+
+    def _stop_grab_thread(self):
+        self._stop.set()
+        if self._grab_thread is not None:
+            # A stalled device can block grab() for ~10 s, so don't wait forever.
+            # If it's still alive, _release_camera hands cap ownership to it via
+            # _grab_release/_grab_done.
+            self._grab_thread.join(timeout=1)
+            self._grab_thread = None
+        with self._lock:
+            self._latest = None
+            self._free_frames = []
+
+    def _release_camera(self):
+        cap, self.cap = self.cap, None
+        self._stop_grab_thread()
+        if cap is None:
             return
 
-        ok, frame = self.cap.read()
-        if not ok or frame is None:
+        # Never release a capture another thread is still inside: if the grab
+        # thread hasn't exited, it releases cap itself on the way out.
+        with self._cap_lock:
+            if self._grab_done.is_set():
+                try:
+                    cap.release()
+                except Exception:
+                    pass
+            else:
+                self._grab_release.set()
+
+        # Fresh "no grab thread" state for whatever capture is opened next.
+        self._grab_release = threading.Event()
+        self._grab_done = threading.Event()
+        self._grab_done.set()
+
+    def _update_camera_frame(self):
+        # Take the newest frame (if any) and drop it from the slot. The previous
+        # last_frame goes back to the grab thread; only this (UI) thread recycles it,
+        # so on_capture always sees a stable buffer.
+        with self._lock:
+            frame = self._latest
+            self._latest = None
+            if frame is not None and self.last_frame is not None:
+                self._free_frames.append(self.last_frame)
+
+        if frame is None:
             return
 
         self.last_frame = frame
 
-        pix = qpixmap_from_bgr(frame)
-        self.image_label.setPixmap(
-            pix.scaled(
-                self.image_label.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation,
-            )
-        )
+        if self._display_size is None:
+            self._update_display_size()
+        box_w, box_h = self._display_size
+
+        # Resize straight into the label-fitted display buffer: Numba box filter for
+        # exact large integer downscales (once compiled), otherwise OpenCV (SIMD).
+        fh, fw = frame.shape[:2]
+        tw, th = fit_size(fw, fh, box_w, box_h)
+        self._ensure_display_buffer(tw, th)
+
+        ds = self._downscale
+        k = ds.box_factor(fw, fh, tw, th) if ds is not None else 0
+
+        if k:
+            ds.box_downscale(frame, self._display_buf, k)
+        else:
+            interp = cv2.INTER_AREA if tw < fw else cv2.INTER_LINEAR
+            cv2.resize(frame, (tw, th), dst=self._display_buf, interpolation=interp)
+
+        # Already label-sized: no Qt-side scale. If one is ever needed here, use
+        # Qt.FastTransformation; SmoothTransformation is kept for on_load_image stills.
+        self.image_label.setPixmap(QPixmap.fromImage(self._qimage))
+
+    def _ensure_display_buffer(self, tw: int, th: int):
+        if self._display_buf is not None and self._display_buf.shape[:2] == (th, tw):
+            return
+        self._display_buf = np.empty((th, tw, 3), dtype=np.uint8)
+        self._qimage = QImage(self._display_buf.data, tw, th, 3 * tw, QImage.Format_BGR888)
+
+    def _update_display_size(self):
+        size = self.image_label.size()
+        self._display_size = (max(1, size.width()), max(1, size.height()))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_display_size()
 
     def on_capture(self):
         if not self.camera_enabled:
@@ -389,12 +631,27 @@ class MainWindow(QMainWindow):
             self.statusBar().showMessage("No camera frame yet.")
             return
 
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg")
-        tmp_path = tmp.name
-        tmp.close()
-
-        self.temp_files.append(tmp_path)
-        cv2.imwrite(tmp_path, self.last_frame)
+        # A new capture supersedes any identify still in flight.
+        self._cancel_pending()
+
+        if self._capture_i == len(self.temp_files):
+            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg")
+            tmp.close()
+            self.temp_files.append(tmp.name)
+        tmp_path = self.temp_files[self._capture_i]
+        self._capture_i = (self._capture_i + 1) % self.capture_ring_size
+
+        # CAPTURE_JPEG_QUALITY (default 85) roughly halves the upload vs OpenCV's
+        # default 95 with no visible loss.
+        cv2.imwrite(
+            tmp_path,
+            self.last_frame,
+            [
+                cv2.IMWRITE_JPEG_QUALITY, self.capture_jpeg_quality,
+                cv2.IMWRITE_JPEG_OPTIMIZE, 1,
+                cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+            ],
+        )
 
         self.current_image_path = tmp_path
         self.loaded_path_label.setText(tmp_path)
@@ -417,11 +674,12 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
-        try:
-            if self.cap is not None:
-                self.cap.release()
-        except Exception:
-            pass
+        self._release_camera()
+
+        # Drop any pending result and tell the worker to exit; it closes the HTTP
+        # client itself once an in-flight call (if any) has returned.
+        self._cancel_pending()
+        self._identify_queue.put(None)
 
         super().closeEvent(event)
 
@@ -436,14 +694,40 @@ class MainWindow(QMainWindow):
         self.identify_btn.setEnabled(False)
         self.statusBar().showMessage("Identifying…")
 
-        def run():
+        self._identify_gen += 1
+        self._identify_queue.put((self._identify_gen, img_path, sample_type))
+
+    def _cancel_pending(self):
+        # A running call can't be interrupted; bumping the generation makes the
+        # worker skip queued requests and discard the in-flight result.
+        self._identify_gen += 1
+
+    def _identify_worker(self):
+        # Runs on the worker thread; signals marshal results to the UI thread.
+        while True:
+            item = self._identify_queue.get()
+            if item is None:
+                break
+            gen, img_path, sample_type = item
+            if gen != self._identify_gen:
+                continue
             try:
-                result = identify_image(img_path, sample_type=sample_type)
-                self.signals.success.emit(result)
+                result = _identify(img_path, sample_type)
             except Exception as e:
-                self.signals.error.emit(str(e))
+                if gen == self._identify_gen:
+                    self.signals.error.emit(str(e))
+                continue
+            if gen == self._identify_gen:
+                self.signals.success.emit(result)
 
-        threading.Thread(target=run, daemon=True).start()
+        # No call is using the shared httpx client any more. Only close it if
+        # identify_image was ever imported.
+        identify_mod = sys.modules.get("identify_image")
+        if identify_mod is not None:
+            try:
+                identify_mod.close_client()
+            except Exception:
+                pass
 
     # =====================================================
     # Signal handlers
@@ -0,0 +1,64 @@
+"""
+Optional Numba box-downscale kernel for oversized (e.g. 4K) camera frames.
+
+The preview size is always the label fit; the kernel is only used when that
+fit is an exact integer downscale of a large source (see box_factor). Everything
+else, or a missing Numba, falls back to cv2.resize.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit, prange  # type: ignore
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+if HAVE_NUMBA:
+
+    @njit(parallel=True, cache=True)
+    def _box_downscale(src, dst, k):
+        oh, ow, ch = dst.shape
+        area = k * k
+        half = area // 2
+        for y in prange(oh):
+            y0 = y * k
+            for x in range(ow):
+                x0 = x * k
+                for c in range(ch):
+                    acc = 0
+                    for dy in range(k):
+                        for dx in range(k):
+                            acc += src[y0 + dy, x0 + dx, c]
+                    dst[y, x, c] = (acc + half) // area
+
+
+# Below this, cv2.resize(INTER_AREA) already takes its SIMD integer-ratio path.
+MIN_FACTOR = 4
+
+
+def box_factor(src_w: int, src_h: int, dst_w: int, dst_h: int) -> int:
+    """
+    k if dst is exactly src / k on both axes with k >= MIN_FACTOR, else 0
+    (also 0 if Numba is missing).
+    """
+    if not HAVE_NUMBA or src_w % dst_w:
+        return 0
+    k = src_w // dst_w
+    if k < MIN_FACTOR or src_h != dst_h * k:
+        return 0
+    return k
+
+
+def box_downscale(src: np.ndarray, dst: np.ndarray, k: int) -> None:
+    """Average k*k blocks of src (HxWx3 uint8) into dst of shape (H // k, W // k, 3)."""
+    _box_downscale(src, dst, k)
+
+
+def warm_up() -> None:
+    """Trigger JIT compilation up front so the first camera frame doesn't pay for it."""
+    if HAVE_NUMBA:
+        _box_downscale(np.zeros((4, 4, 3), np.uint8), np.empty((2, 2, 3), np.uint8), 2)
@@ -1,34 +1,89 @@
 import base64
 import json
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from secrets_store import get_openai_api_key
+import cv2
+import httpx
+import numpy as np
 from openai import OpenAI
 
+# HTTP/2 needs the optional h2 package (pip install 'httpx[http2]').
+try:
+    import h2  # type: ignore  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# orjson is optional; it parses ~3-5x faster than the stdlib.
+try:
+    import orjson  # type: ignore
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 _client = None
+_http = None
 
 def get_client():
-    global _client
+    global _client, _http
     if _client is None:
         api_key = os.environ.get("OPENAI_API_KEY") or get_openai_api_key()
         if not api_key:
             raise RuntimeError(
                 "OpenAI API key not set. Set OPENAI_API_KEY (dev) or add a key in the app."
             )
-        _client = OpenAI(api_key=api_key)
+        # Persistent connection pool: repeated identifies skip the TLS handshake.
+        _http = httpx.Client(
+            http2=_HTTP2,
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60),
+        )
+        _client = OpenAI(api_key=api_key, http_client=_http)
     return _client
 
+
+def close_client():
+    global _client, _http
+    if _http is not None:
+        _http.close()
+    _client = None
+    _http = None
+
 MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
 
+# Near-duplicate frames (same dHash + sample type) reuse the prior result instead
+# of another API round-trip. IDENTIFY_CACHE=0 disables.
+CACHE_ENABLED = os.getenv("IDENTIFY_CACHE", "1").strip().lower() not in {"0", "false", "no", "off", ""}
+CACHE_MAX = 64
+_cache: Dict[tuple, Dict[str, Any]] = {}
+
+
+def _dhash(image_path: str) -> Optional[bytes]:
+    """64-bit difference hash of the image, or None if it can't be hashed."""
+    # The hash is only an optimisation: any decode/resize failure means "no cache".
+    try:
+        # 1/8-scale decode (JPEG DCT scaling) is plenty for a 9x8 thumbnail.
+        img = cv2.imread(image_path, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+        if img is None:
+            return None
+        small = cv2.resize(img, (9, 8), interpolation=cv2.INTER_AREA)
+    except cv2.error:
+        return None
+    return np.packbits(small[:, 1:] > small[:, :-1]).tobytes()
+
 
 def _b64_data_url(image_path: str) -> str:
     # Basic MIME detection
     ext = os.path.splitext(image_path)[1].lower()
     mime = "image/png" if ext == ".png" else "image/jpeg"
 
+    # Encode in chunks into one growing buffer instead of read -> encode -> decode -> f-string.
+    # The chunk size is a multiple of 3 so no padding lands mid-stream.
+    buf = bytearray(f"data:{mime};base64,".encode("ascii"))
     with open(image_path, "rb") as f:
-        b64 = base64.b64encode(f.read()).decode("utf-8")
-    return f"data:{mime};base64,{b64}"
+        while chunk := f.read(57 * 1024):
+            buf += base64.b64encode(chunk)
+    return buf.decode("ascii")
 
 
 def _context_hint(sample_type: str) -> str:
@@ -57,21 +112,36 @@ def _context_hint(sample_type: str) -> str:
     return hints.get(st, hints["other"])
 
 
-def _strip_code_fence(text: str) -> str:
-    t = (text or "").strip()
-    if t.startswith("```"):
-        # remove first fence line
-        t = t.split("\n", 1)[1] if "\n" in t else ""
-        # remove trailing fence
-        if t.rstrip().endswith("```"):
-            t = t.rstrip()[:-3]
-        t = t.strip()
-        if t.lower().startswith("json"):
-            t = t[4:].lstrip()
-    return t
+# Structured-output schema: the API guarantees parseable JSON with exactly these
+# keys, so no code-fence stripping is needed.
+_RESULT_FORMAT = {
+    "type": "json_schema",
+    "name": "identification",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "best_guess_name": {"type": "string"},
+            "confidence": {"type": "integer", "minimum": 0, "maximum": 100},
+            "description": {"type": "string"},
+            "features_used": {"type": "string"},
+        },
+        "required": ["best_guess_name", "confidence", "description", "features_used"],
+        "additionalProperties": False,
+    },
+}
 
 
 def identify_image(image_path: str, sample_type: str = "Other") -> Dict[str, Any]:
+    key = None
+    if CACHE_ENABLED:
+        h = _dhash(image_path)
+        if h is not None:
+            key = (h, sample_type)
+            cached = _cache.get(key)
+            if cached is not None:
+                return dict(cached)
+
     client = get_client()
 
     data_url = _b64_data_url(image_path)
@@ -97,12 +167,13 @@ def identify_image(image_path: str, sample_type: str = "Other") -> Dict[str, Any
                 ],
             }
         ],
+        text={"format": _RESULT_FORMAT},
     )
 
-    text = _strip_code_fence(getattr(resp, "output_text", "") or "")
+    text = (getattr(resp, "output_text", "") or "").strip()
 
     try:
-        result = json.loads(text)
+        result = _json_loads(text)
     except Exception:
         raise ValueError(f"Model did not return JSON. Got:\n{text}")
 
@@ -120,4 +191,10 @@ def identify_image(image_path: str, sample_type: str = "Other") -> Dict[str, Any
         result["confidence"] = 0
 
     result["confidence"] = max(0, min(100, result["confidence"]))
+
+    if key is not None:
+        # Dicts keep insertion order, so the first key is the oldest (FIFO eviction).
+        if len(_cache) >= CACHE_MAX:
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = dict(result)
     return result